@@ -1,22 +1,42 @@
+# Patch the standard library before anything else is imported so that the
+# sockets used by Selenium and boto3 yield to other requests while waiting
+from gevent import monkey
+monkey.patch_all()
+
 import os
 import logging
-from functools import lru_cache
-from flask import Flask, request, jsonify
-import json
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import gevent
+from cachetools import TLRUCache
+from flask import Flask, request
+import orjson
 import boto3
-from botocore.exceptions import ClientError
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 import datetime
+import re
 import time
 from flask_cors import CORS
+from flask_caching import Cache
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import Optional
 
 # Selenium and WebDriver imports
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Logging configuration
 # This sets up how our application will log information
@@ -26,31 +46,85 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
+# Per-command WebDriver and connection chatter from these libraries isn't worth the log volume
+logging.getLogger("selenium").setLevel(logging.WARNING)
+logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 # AWS DynamoDB configuration
+# Short timeouts with adaptive retries so throttling is retried with backoff instead of
+# hanging a request, and a connection pool large enough for concurrent gevent requests
+boto_config = Config(
+    retries={'mode': 'adaptive', 'max_attempts': int(os.environ.get('DDB_MAX_ATTEMPTS', 5))},
+    connect_timeout=float(os.environ.get('DDB_CONNECT_TIMEOUT', 1)),
+    read_timeout=float(os.environ.get('DDB_READ_TIMEOUT', 3)),
+    max_pool_connections=int(os.environ.get('DDB_MAX_POOL_CONNECTIONS', 64)),
+    tcp_keepalive=True
+)
+
 # Initialize connection to DynamoDB
 try:
-    # Connect directly to AWS DynamoDB
-    dynamodb = boto3.resource(
+    # Table management always goes straight to DynamoDB (DAX only serves data-plane calls)
+    ddb_admin = boto3.client(
         'dynamodb',
         region_name='ap-south-1',
         aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
+        aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+        config=boto_config
     )
-    logger.info("Connected to AWS DynamoDB")
+    
+    if os.environ.get('DAX_ENDPOINT'):
+        # Send item reads and writes through the DAX cluster when one is configured
+        from amazondax import AmazonDaxClient
+        dynamodb = AmazonDaxClient.resource(
+            endpoint_url=os.environ['DAX_ENDPOINT'],
+            region_name='ap-south-1',
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            config=boto_config
+        )
+        logger.info("Connected to DynamoDB through DAX at %s", os.environ['DAX_ENDPOINT'])
+    else:
+        # Connect directly to AWS DynamoDB
+        dynamodb = boto3.resource(
+            'dynamodb',
+            region_name='ap-south-1',
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            config=boto_config
+        )
+        logger.info("Connected to AWS DynamoDB")
 except Exception as e:
-    logger.error(f"Failed to connect to AWS DynamoDB: {str(e)}")
+    logger.error("Failed to connect to AWS DynamoDB: %s", e)
     raise
 
+# Index for listing a doctor's transcriptions in time order with Query instead of Scan
+DOCTOR_INDEX = 'DoctorIdIndex'
+DOCTOR_INDEX_SPEC = {
+    'IndexName': DOCTOR_INDEX,
+    'KeySchema': [
+        {
+            'AttributeName': 'doctorId',
+            'KeyType': 'HASH'  # Partition key
+        },
+        {
+            'AttributeName': 'sk',
+            'KeyType': 'RANGE'  # Sort key, "<timestamp>#<transcribeId>"
+        }
+    ],
+    'Projection': {
+        'ProjectionType': 'ALL'
+    }
+}
+
 # Check if table exists and create it if needed
 def ensure_table_exists():
     try:
         # Check if the table exists
-        existing_tables = dynamodb.meta.client.list_tables()['TableNames']
+        existing_tables = ddb_admin.list_tables()['TableNames']
         
         if 'transcribe' not in existing_tables:
             logger.info("Creating 'transcribe' table in AWS DynamoDB...")
-            table = dynamodb.create_table(
+            ddb_admin.create_table(
                 TableName='transcribe',
                 KeySchema=[
                     {
@@ -62,8 +136,17 @@ def ensure_table_exists():
                     {
                         'AttributeName': 'transcribeId',
                         'AttributeType': 'S'  # String type
+                    },
+                    {
+                        'AttributeName': 'doctorId',
+                        'AttributeType': 'S'
+                    },
+                    {
+                        'AttributeName': 'sk',
+                        'AttributeType': 'S'
                     }
                 ],
+                GlobalSecondaryIndexes=[DOCTOR_INDEX_SPEC],
                 BillingMode='PAY_PER_REQUEST'  # On-demand capacity
                 # Or use provisioned capacity:
                 # ProvisionedThroughput={
@@ -72,10 +155,11 @@ def ensure_table_exists():
                 # }
             )
             # Wait until the table exists
-            table.meta.client.get_waiter('table_exists').wait(TableName='transcribe')
+            ddb_admin.get_waiter('table_exists').wait(TableName='transcribe')
             logger.info("Table 'transcribe' created successfully in AWS!")
         else:
             logger.info("Table 'transcribe' already exists in AWS")
+            ensure_doctor_index_exists()
             
         return True
         
@@ -84,49 +168,278 @@ def ensure_table_exists():
             logger.info("Table already exists or is being created")
             return True
         else:
-            logger.error(f"Error creating table: {str(e)}")
+            logger.error("Error creating table: %s", e)
+            return False
+
+# Add the doctor index to a table created before it existed
+def ensure_doctor_index_exists():
+    description = ddb_admin.describe_table(TableName='transcribe')['Table']
+    indexes = description.get('GlobalSecondaryIndexes', [])
+    if any(index['IndexName'] == DOCTOR_INDEX for index in indexes):
+        return
+    
+    # Adding a GSI leaves existing items and the transcribeId key untouched.
+    # Items saved before this change have no sk and simply don't appear in the index.
+    logger.info("Adding '%s' index to 'transcribe' table...", DOCTOR_INDEX)
+    ddb_admin.update_table(
+        TableName='transcribe',
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'doctorId',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'sk',
+                'AttributeType': 'S'
+            }
+        ],
+        GlobalSecondaryIndexUpdates=[
+            {
+                'Create': DOCTOR_INDEX_SPEC
+            }
+        ]
+    )
+    logger.info("Index '%s' is being built in the background", DOCTOR_INDEX)
+
+# Scheme check cache configuration
+SCHEME_CACHE_TABLE = 'scheme_cache'
+SCHEME_CACHE_TTL = int(os.environ.get('SCHEME_CACHE_TTL', 600))  # Seconds a check result stays cached
+
+# Check if the scheme check cache table exists and create it if needed
+def ensure_scheme_cache_table_exists():
+    try:
+        existing_tables = ddb_admin.list_tables()['TableNames']
+        
+        if SCHEME_CACHE_TABLE not in existing_tables:
+            logger.info("Creating '%s' table in AWS DynamoDB...", SCHEME_CACHE_TABLE)
+            ddb_admin.create_table(
+                TableName=SCHEME_CACHE_TABLE,
+                KeySchema=[
+                    {
+                        'AttributeName': 'schemeId',
+                        'KeyType': 'HASH'  # Partition key
+                    }
+                ],
+                AttributeDefinitions=[
+                    {
+                        'AttributeName': 'schemeId',
+                        'AttributeType': 'S'  # String type
+                    }
+                ],
+                BillingMode='PAY_PER_REQUEST'  # On-demand capacity
+            )
+            ddb_admin.get_waiter('table_exists').wait(TableName=SCHEME_CACHE_TABLE)
+            
+            # Let DynamoDB delete expired entries on its own
+            ddb_admin.update_time_to_live(
+                TableName=SCHEME_CACHE_TABLE,
+                TimeToLiveSpecification={
+                    'Enabled': True,
+                    'AttributeName': 'expiresAt'
+                }
+            )
+            logger.info("Table '%s' created successfully in AWS!", SCHEME_CACHE_TABLE)
+        else:
+            logger.info("Table '%s' already exists in AWS", SCHEME_CACHE_TABLE)
+        
+        return True
+    
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceInUseException':
+            logger.info("Table already exists or is being created")
+            return True
+        else:
+            logger.error("Error creating table: %s", e)
             return False
 
-# Try to ensure the table exists
-if ensure_table_exists():
-    table = dynamodb.Table('transcribe')
-else:
-    logger.error("Failed to ensure table exists. Some operations may fail.")
-    table = dynamodb.Table('transcribe')  # Still try to reference the table
+# Table resources are lazy and need no validation at startup. Missing tables are
+# created once per deployment with: WARM_POOL=0 FLASK_APP=schema flask init-table
+# or, for single-process setups, by starting with ENSURE_TABLE=1
+if os.environ.get('ENSURE_TABLE') == '1':
+    if not (ensure_table_exists() and ensure_scheme_cache_table_exists()):
+        logger.error("Failed to ensure DynamoDB tables exist")
+
+table = dynamodb.Table('transcribe')
+scheme_cache_table = dynamodb.Table(SCHEME_CACHE_TABLE)
+
+def warm_table_connection():
+    """
+    Describe the table once so the first write finds an open connection to DynamoDB
+    """
+    try:
+        table.load()
+    except (ClientError, BotoCoreError) as e:
+        logger.warning("Could not load table description: %s", e)
+
+# Done in the background so an unreachable DynamoDB can't hold up startup or /health
+# (DAX doesn't serve DescribeTable, so skip it there)
+if not os.environ.get('DAX_ENDPOINT'):
+    threading.Thread(target=warm_table_connection, name="dynamodb-warmup", daemon=True).start()
+
+# Eligibility checker configuration
+CHECKER_URL = "https://www.sspcrs.ie/portal/checker/pub/check"
+# How scheme IDs are checked: 'auto' tries plain HTTP and falls back to Selenium,
+# 'http' never starts a browser, 'selenium' always uses one
+CHECKER_BACKEND = os.environ.get('CHECKER_BACKEND', 'auto')
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+ERROR_SELECTOR = ".alert-danger"
+RESULT_SELECTOR = "#page-content > div.main-box > div.pt-2 > div > div"
+POLL_FREQUENCY = 0.1  # Seconds between WebDriverWait checks
+# Which outcome the result page shows, read in one round trip: the error banner
+# (arguments[0]) wins over the result card (arguments[1]). innerText (not
+# textContent) keeps the line breaks parse_eligibility_text relies on.
+OUTCOME_SCRIPT = """
+var error = document.querySelector(arguments[0]);
+if (error) return {kind: 'error', text: error.innerText.trim()};
+var card = document.querySelector(arguments[1]);
+var text = card ? card.innerText.trim() : '';
+return {kind: text ? 'success' : 'none', text: text};
+"""
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')  # Bundled with the Docker image
+SELENIUM_URL = os.environ.get('SELENIUM_URL')  # Shared Selenium server, e.g. http://selenium:4444/wd/hub
+
+# Selenium locators, all ID/CSS since Chrome evaluates those faster than XPath
+SEL_INPUT = (By.ID, "schemeIdInput")
+SEL_SUBMIT = (By.CSS_SELECTOR, "button[type='submit']")
+SEL_ERROR = (By.CSS_SELECTOR, ERROR_SELECTOR)
+SEL_RESULT = (By.CSS_SELECTOR, RESULT_SELECTOR)
+
+def build_chrome_options():
+    """
+    Configure Chrome options for optimal performance in Docker environment.
+    Built once at import; each new driver serializes them to its own capabilities.
+    """
+    options = Options()
+    options.add_argument("--headless")  # Run in headless mode (no GUI)
+    options.add_argument("--no-sandbox")  # Required in Docker
+    options.add_argument("--disable-dev-shm-usage")  # Required in Docker 
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920x1080")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--blink-settings=imagesEnabled=false")  # Disable images for speed
+    options.add_argument("--disable-features=Translate,BackForwardCache,InterestFeedContentSuggestions,AcceptCHFrame")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--aggressive-cache-discard")
+    options.add_argument("--log-level=3")  # Only fatal errors from Chrome itself
+    options.page_load_strategy = 'none'  # Don't wait for page loads, we wait for the elements we need
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    return options
+
+CHROME_OPTIONS = build_chrome_options()
+
+# Selenium's HTTP connections to chromedriver never time out by default, so a hung
+# browser would hold its request forever; set before any driver opens its pool
+WEBDRIVER_COMMAND_TIMEOUT = int(os.environ.get('WEBDRIVER_COMMAND_TIMEOUT', 30))  # Seconds per WebDriver command
+RemoteConnection.set_timeout(WEBDRIVER_COMMAND_TIMEOUT)
 
 class WebDriverPool:
     """
     This class manages a pool of Chrome WebDriver instances
     to efficiently handle multiple requests
     """
-    _drivers = []  # Class variable to store WebDriver instances
-    MAX_POOL_SIZE = 5  # Maximum number of drivers to keep in pool
+    MAX_POOL_SIZE = int(os.environ.get('WEBDRIVER_POOL_SIZE', 5))  # Maximum number of drivers to keep in pool
+    ACQUIRE_TIMEOUT = 30  # Seconds to wait for a busy driver to be released
+    HEALTH_CHECK_TIMEOUT = 1  # Seconds an idle driver gets to answer before it is replaced
+    CONNECTION_POOL_SIZE = MAX_POOL_SIZE * 4  # Keep-alive sockets each driver may hold to chromedriver
+    # Resources the checker page loads but we never need. Stylesheets stay: the result is
+    # read with innerText, whose line breaks and hidden content follow the page's CSS
+    BLOCKED_URLS = [
+        '*.woff*', '*.ttf', '*.svg', '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.ico',
+        '*google-analytics*', '*googletagmanager*', '*hotjar*', '*analytics*', '*gtag*'
+    ]
+    # Idle WebDriver instances, most recently used first so hot browsers with warm caches are reused
+    _pool = queue.LifoQueue(maxsize=MAX_POOL_SIZE)
+    _created = 0  # Total drivers alive, idle or checked out
+    _lock = threading.Lock()  # Guards _created
     
     @classmethod
     def get_driver(cls):
         """
-        Get a WebDriver from the pool or create a new one if needed
+        Get a healthy idle WebDriver from the pool, create a new one if the pool
+        is not yet full, or wait for another request to release one
         """
-        if len(cls._drivers) < cls.MAX_POOL_SIZE:
+        deadline = time.monotonic() + cls.ACQUIRE_TIMEOUT
+        while True:
             try:
-                # Create new driver with optimized settings
-                options = cls._get_optimized_options()
+                driver = cls._pool.get_nowait()
+            except queue.Empty:
+                if cls._reserve_slot():
+                    return cls._create_driver()
                 
-                # In Docker Selenium image, Chrome is already set up correctly
-                driver = webdriver.Chrome(options=options)
-                
-                cls._drivers.append(driver)
-                logger.info("Successfully created a new WebDriver instance")
+                # Pool is at capacity, wait for a driver to be released
+                try:
+                    driver = cls._pool.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    logger.error("No WebDriver instances available in pool")
+                    return None
+            
+            # Replace drivers whose browser has crashed or hung since they were released
+            if cls._is_healthy(driver):
                 return driver
-            except Exception as e:
-                logger.error(f"Failed to create WebDriver: {str(e)}")
-                return None
-        
-        # Return first available driver if pool is full
-        if cls._drivers:
-            return cls._drivers.pop(0)
-        else:
-            logger.error("No WebDriver instances available in pool")
+            logger.warning("Discarding unresponsive WebDriver instance")
+            # Free the slot now so this request can start a replacement, and quit in the
+            # background since quitting a hung browser can block too
+            with cls._lock:
+                cls._created -= 1
+            threading.Thread(target=cls._quit_quietly, args=(driver,), daemon=True).start()
+    
+    @classmethod
+    def warm(cls):
+        """
+        Create drivers until the pool is full so requests don't pay Chrome's start-up cost
+        """
+        while cls._reserve_slot():
+            driver = cls._create_driver()
+            if not driver:
+                break
+            cls.release_driver(driver)
+        logger.info("WebDriver pool warmed with %s idle drivers", cls._pool.qsize())
+    
+    @classmethod
+    def _reserve_slot(cls):
+        """
+        Claim room for one more driver, returns False if the pool is at capacity
+        """
+        with cls._lock:
+            if cls._created < cls.MAX_POOL_SIZE:
+                cls._created += 1
+                return True
+            return False
+    
+    @classmethod
+    def _create_driver(cls):
+        """
+        Start a new Chrome WebDriver for a slot claimed with _reserve_slot()
+        """
+        try:
+            # Create new driver with the shared optimized settings
+            if SELENIUM_URL:
+                # Open a session on the shared browser service instead of starting Chrome here.
+                # The Chromium connection keeps the CDP command available on remote sessions.
+                executor = ChromiumRemoteConnection(
+                    remote_server_addr=SELENIUM_URL,
+                    vendor_prefix='goog',
+                    browser_name='chrome',
+                    keep_alive=True
+                )
+                driver = webdriver.Remote(command_executor=executor, options=CHROME_OPTIONS)
+            else:
+                # Use the chromedriver shipped with the image, no download or version check needed
+                service = Service(executable_path=CHROMEDRIVER_PATH, service_args=["--silent"], log_path=os.devnull)
+                driver = webdriver.Chrome(service=service, options=CHROME_OPTIONS)
+            cls._widen_connection_pool(driver)
+            cls._block_unneeded_resources(driver)
+            
+            logger.info("Successfully created a new WebDriver instance")
+            return driver
+        except Exception as e:
+            with cls._lock:
+                cls._created -= 1
+            logger.error("Failed to create WebDriver: %s", e)
             return None
     
     @classmethod
@@ -135,42 +448,389 @@ class WebDriverPool:
         Return a driver to the pool or close it if pool is full
         """
         if driver:
-            if len(cls._drivers) < cls.MAX_POOL_SIZE:
-                cls._drivers.append(driver)
-            else:
-                try:
-                    driver.quit()
-                except Exception as e:
-                    logger.error(f"Error closing driver: {str(e)}")
+            try:
+                cls._pool.put_nowait(driver)
+            except queue.Full:
+                cls._discard_driver(driver)
+    
+    @classmethod
+    def _discard_driver(cls, driver):
+        """
+        Close a driver and free its slot in the pool
+        """
+        try:
+            cls._quit_quietly(driver)
+        finally:
+            with cls._lock:
+                cls._created -= 1
     
     @staticmethod
-    def _get_optimized_options():
+    def _quit_quietly(driver):
+        """
+        Quit a driver, logging rather than raising if the browser is already gone
+        """
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error("Error closing driver: %s", e)
+    
+    @classmethod
+    def _is_healthy(cls, driver):
+        """
+        Check the browser behind a driver still answers commands within HEALTH_CHECK_TIMEOUT
+        """
+        # A gevent timeout, since the command timeout on the connection is much longer
+        try:
+            with gevent.Timeout(cls.HEALTH_CHECK_TIMEOUT):
+                return driver.execute_script("return 1") == 1
+        except (Exception, gevent.Timeout):
+            return False
+    
+    @classmethod
+    def _widen_connection_pool(cls, driver):
+        """
+        Let the driver keep several keep-alive connections to chromedriver
+        instead of the single one Selenium creates by default
+        """
+        manager = getattr(driver.command_executor, '_conn', None)
+        if manager is not None:
+            manager.connection_pool_kw.update(maxsize=cls.CONNECTION_POOL_SIZE, block=False)
+            # Drop the pool opened during session start so it is rebuilt with the new size
+            manager.clear()
+    
+    @classmethod
+    def _block_unneeded_resources(cls, driver):
         """
-        Configure Chrome options for optimal performance in Docker environment
+        Stop the browser fetching fonts, images and trackers so pages finish loading sooner
         """
-        options = Options()
-        options.add_argument("--headless")  # Run in headless mode (no GUI)
-        options.add_argument("--no-sandbox")  # Required in Docker
-        options.add_argument("--disable-dev-shm-usage")  # Required in Docker 
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920x1080")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--blink-settings=imagesEnabled=false")  # Disable images for speed
-        options.page_load_strategy = 'eager'
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        return options
+        try:
+            # Sent as a raw command so it works for local and remote drivers alike
+            driver.execute('executeCdpCommand', {'cmd': 'Network.enable', 'params': {}})
+            driver.execute('executeCdpCommand', {'cmd': 'Network.setBlockedURLs', 'params': {'urls': cls.BLOCKED_URLS}})
+        except Exception as e:
+            logger.warning("Could not block unneeded resources: %s", e)
 
 # Create Flask application instance
 app = Flask(__name__)
 CORS(app)
-@lru_cache(maxsize=100)
+
+# Cache for rendered /check_status responses, shared between workers through Redis when
+# REDIS_URL is set. Kept short because it sits on top of the scheme check caches.
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 60))
+cache = Cache(app, config={
+    "CACHE_TYPE": "RedisCache" if os.environ.get('REDIS_URL') else "SimpleCache",
+    "CACHE_REDIS_URL": os.environ.get('REDIS_URL'),
+    "CACHE_DEFAULT_TIMEOUT": RESPONSE_CACHE_TIMEOUT
+})
+
+def json_response(payload, status=200):
+    """
+    Build a JSON response serialized with orjson instead of Flask's jsonify
+    """
+    return app.response_class(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), status=status, mimetype='application/json')
+
+def load_json_body():
+    """
+    Parse the request body with orjson, skipping Flask's content-type sniffing
+    """
+    return orjson.loads(request.get_data(cache=False))
+
+@app.cli.command("ensure-table")
+def ensure_tables_command():
+    """
+    Create the DynamoDB tables used by this service if they don't exist yet
+    """
+    transcribe_ok = ensure_table_exists()
+    scheme_cache_ok = ensure_scheme_cache_table_exists()
+    if not (transcribe_ok and scheme_cache_ok):
+        raise SystemExit("Failed to ensure DynamoDB tables exist")
+
+app.cli.add_command(ensure_tables_command, "init-table")
+
+# Start Chrome instances in the background so early requests find them ready
+if CHECKER_BACKEND != 'http' and os.environ.get('WARM_POOL', '1') == '1':
+    threading.Thread(target=WebDriverPool.warm, name="webdriver-warmup", daemon=True).start()
+
+# Cap on checks in flight against the checker at once; with gevent each waiting
+# request is a cheap greenlet, so this bounds load on the checker, not threads
+CHECKER_CONCURRENCY = int(os.environ.get('CHECKER_CONCURRENCY', 50))
+_checker_slots = threading.BoundedSemaphore(CHECKER_CONCURRENCY)
+
+# Shared HTTP session for talking to the checker without a browser
+http_session = requests.Session()
+http_session.headers.update({"User-Agent": USER_AGENT})
+# Retry connection failures and gateway errors quickly; the checker lookup is read-only so POSTs are safe to repeat
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=CHECKER_CONCURRENCY,  # Every concurrent check can keep its connection alive
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(("GET", "POST"))
+    )
+))
+HTTP_TIMEOUT = 10  # Seconds to wait for the checker to respond
+HTTP_CONNECT_TIMEOUT = 3  # Seconds to wait for a connection, so a down host fails fast
+FORM_RETRY_INTERVAL = 600  # Seconds before looking for the form again if the page had none
+FORM_REFRESH_INTERVAL = 30  # Minimum seconds between reloads of a form that stopped working
+UNRECOGNISED_RETRY_INTERVAL = 300  # Seconds to go straight to Selenium after an unreadable response
+UNREACHABLE_RETRY_INTERVAL = 60  # Seconds to go straight to Selenium after the checker couldn't be reached
+
+_checker_form = None  # Cached description of the checker form, see fetch_checker_form()
+_checker_form_missing_since = None  # When the checker page was last seen without a usable form
+_checker_form_fetched_at = None  # When the checker form was last (re)loaded
+_checker_unrecognised_since = None  # When a submitted form last gave a response we couldn't read
+_checker_unreachable_since = None  # When a request to the checker last failed outright
+_checker_form_lock = threading.Lock()  # Guards the form state above, never held during requests
+
+# The checker's error banner when an identifier isn't on any scheme; other banners
+# (expired sessions, maintenance notices) must not be cached as "not found"
+_NOT_FOUND_RE = re.compile(r'not found', re.IGNORECASE)
+
+# Block-level tags that start a new line in the text Chrome would render
+_BLOCK_TAGS = {"div", "p", "li", "tr", "dt", "dd", "h1", "h2", "h3", "h4", "h5", "h6", "br", "form", "table", "ul", "ol", "section"}
+
+def fetch_checker_form():
+    """
+    Load the checker page and describe the form that submits a scheme ID.
+    Returns None if the page has no plain HTML form we can post to.
+    """
+    response = http_session.get(CHECKER_URL, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+    response.raise_for_status()
+    page = lxml.html.fromstring(response.content, base_url=response.url)
+    
+    forms = page.xpath("//form[.//input[@id='schemeIdInput']]")
+    if not forms:
+        return None
+    form = forms[0]
+    scheme_input = form.xpath(".//input[@id='schemeIdInput']")[0]
+    if not scheme_input.get("name"):
+        return None
+    
+    # Keep hidden fields (CSRF tokens etc.) and a named submit button if the server expects one
+    fields = dict(form.form_values())
+    for button in form.xpath(".//button[@type='submit'][@name]"):
+        fields[button.get("name")] = button.get("value", "")
+    
+    return {
+        "action": form.action or response.url,
+        "method": (form.method or "GET").upper(),
+        "input_name": scheme_input.get("name"),
+        "fields": fields
+    }
+
+def get_checker_form(stale=None):
+    """
+    Return the cached checker form, loading it on first use. Passing the form that just
+    failed as stale reloads it, at most once per FORM_REFRESH_INTERVAL.
+    """
+    global _checker_form, _checker_form_missing_since, _checker_form_fetched_at
+    with _checker_form_lock:
+        # Another request may already have replaced the stale form
+        if _checker_form and _checker_form is not stale:
+            return _checker_form
+        if (stale is None and _checker_form_missing_since
+                and time.monotonic() - _checker_form_missing_since < FORM_RETRY_INTERVAL):
+            return None
+        if (stale is not None and _checker_form_fetched_at
+                and time.monotonic() - _checker_form_fetched_at < FORM_REFRESH_INTERVAL):
+            return None
+        _checker_form_fetched_at = time.monotonic()
+    
+    # Load outside the lock so other checks don't queue behind this request
+    form = fetch_checker_form()
+    with _checker_form_lock:
+        _checker_form = form
+        if form:
+            _checker_form_missing_since = None
+        else:
+            logger.warning("Checker page has no plain HTML form, using Selenium")
+            _checker_form_missing_since = time.monotonic()
+    return form
+
+def element_text(element):
+    """
+    Approximate the rendered text of an element, one line per block-level element
+    """
+    # Mark block boundaries with a paragraph separator, then collapse whitespace like a browser would
+    for child in element.iter():
+        if isinstance(child.tag, str) and child.tag.lower() in _BLOCK_TAGS:
+            child.text = "\u2029" + (child.text or "")
+            child.tail = "\u2029" + (child.tail or "")
+    lines = (" ".join(line.split()) for line in element.text_content().split("\u2029"))
+    return "\n".join(line for line in lines if line)
+
+def parse_checker_page(html, scheme_id):
+    """
+    Turn a checker response page into a result dict, or None if it has neither
+    an error message nor an eligibility card
+    """
+    page = lxml.html.fromstring(html)
+    
+    errors = page.cssselect(ERROR_SELECTOR)
+    if errors:
+        error_text = element_text(errors[0])
+        if not _NOT_FOUND_RE.search(error_text):
+            logger.warning("Unexpected checker error for scheme ID %s: %s", scheme_id, error_text)
+            return None
+        logger.info("Invalid scheme ID %s: %s", scheme_id, error_text)
+        
+        # Split the error message into title and detail
+        error_lines = error_text.split('\n')
+        error_title = error_lines[0] if error_lines and error_lines[0] else "Patient Not Found"
+        error_detail = error_lines[1] if len(error_lines) > 1 else f"The client identifier '{scheme_id}' was not found on any scheme."
+        
+        return {
+            "status": "error",
+            "code": "PATIENT_NOT_FOUND",
+            "title": error_title,
+            "message": error_detail
+        }
+    
+    cards = page.cssselect(RESULT_SELECTOR)
+    if cards:
+        result = element_text(cards[0])
+        if "Eligibility Details" in result:
+            logger.info("Result obtained for scheme ID %s", scheme_id)
+            return {"status": "success", "result": result}
+    
+    return None
+
+def check_scheme_id_http(scheme_id):
+    """
+    Check scheme ID by submitting the checker form over plain HTTP.
+    Returns None when the answer can't be read this way so the caller can fall back to Selenium.
+    """
+    global _checker_unrecognised_since, _checker_unreachable_since
+    # Don't pay for requests that couldn't be read or made a moment ago
+    unrecognised_since = _checker_unrecognised_since
+    if unrecognised_since and time.monotonic() - unrecognised_since < UNRECOGNISED_RETRY_INTERVAL:
+        return None
+    unreachable_since = _checker_unreachable_since
+    if unreachable_since and time.monotonic() - unreachable_since < UNREACHABLE_RETRY_INTERVAL:
+        return None
+    
+    try:
+        form = None
+        for _ in range(2):
+            # The second pass reloads the form in case it went stale (e.g. an expired CSRF token)
+            form = get_checker_form(stale=form)
+            if not form:
+                break
+            
+            fields = dict(form["fields"])
+            fields[form["input_name"]] = scheme_id
+            
+            logger.info("Checking scheme ID over HTTP: %s", scheme_id)
+            if form["method"] == "POST":
+                response = http_session.post(form["action"], data=fields, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+            else:
+                response = http_session.get(form["action"], params=fields, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT))
+            
+            if response.ok:
+                result = parse_checker_page(response.content, scheme_id)
+                if result:
+                    _checker_unrecognised_since = None
+                    _checker_unreachable_since = None
+                    return result
+        
+        if form is None and _checker_form is None:
+            # No usable form at all; get_checker_form already backs off on its own
+            return None
+        logger.warning("Unrecognised checker response for scheme ID %s, using Selenium for %ss",
+                       scheme_id, UNRECOGNISED_RETRY_INTERVAL)
+        _checker_unrecognised_since = time.monotonic()
+        return None
+    
+    except requests.RequestException as e:
+        logger.warning("HTTP check failed for scheme ID %s, using Selenium for %ss: %s",
+                       scheme_id, UNREACHABLE_RETRY_INTERVAL, e)
+        _checker_unreachable_since = time.monotonic()
+        return None
+
+# In-process cache in front of the shared DynamoDB cache. Entries are
+# (result, expires_at) and expire together with their shared cache entry,
+# so a worker never serves a result the shared cache has already dropped.
+_scheme_cache = TLRUCache(maxsize=2048, ttu=lambda _key, value, _now: value[1], timer=time.time)
+_scheme_cache_lock = threading.Lock()
+
+def is_cacheable_result(result):
+    """
+    Only cache outcomes that won't change if we ask again; transient failures are retried
+    """
+    return result["status"] == "success" or result.get("code") == "PATIENT_NOT_FOUND"
+
+def get_cached_scheme_result(scheme_id):
+    """
+    Look up a scheme check result in the shared DynamoDB cache,
+    returns (result, expires_at) or None
+    """
+    try:
+        item = scheme_cache_table.get_item(Key={'schemeId': scheme_id}).get('Item')
+    except (ClientError, BotoCoreError) as e:
+        logger.warning("Scheme cache lookup failed for %s: %s", scheme_id, e)
+        return None
+    
+    # DynamoDB removes expired items lazily, so check the expiry ourselves
+    if item and item['expiresAt'] > time.time():
+        return item['result'], int(item['expiresAt'])
+    return None
+
+def put_cached_scheme_result(scheme_id, result):
+    """
+    Store a scheme check result in the shared DynamoDB cache, returns when it expires
+    """
+    expires_at = int(time.time()) + SCHEME_CACHE_TTL
+    try:
+        scheme_cache_table.put_item(Item={
+            'schemeId': scheme_id,
+            'result': result,
+            'expiresAt': expires_at
+        })
+    except (ClientError, BotoCoreError) as e:
+        logger.warning("Failed to cache scheme check result for %s: %s", scheme_id, e)
+    return expires_at
+
 def check_scheme_id(scheme_id):
     """
-    Check scheme ID with caching and error handling
+    Check scheme ID, serving repeat lookups from the in-process and shared caches
+    and preferring the plain HTTP check over Selenium
+    """
+    with _scheme_cache_lock:
+        cached = _scheme_cache.get(scheme_id)
+    if cached is not None:
+        return cached[0]
+    
+    cached = get_cached_scheme_result(scheme_id)
+    if cached is None:
+        result = None
+        if CHECKER_BACKEND != 'selenium':
+            with _checker_slots:
+                result = check_scheme_id_http(scheme_id)
+        if result is None:
+            if CHECKER_BACKEND == 'http':
+                result = {
+                    "status": "error",
+                    "code": "NO_RESPONSE",
+                    "title": "System Error",
+                    "message": "Unable to retrieve eligibility information"
+                }
+            else:
+                result = check_scheme_id_selenium(scheme_id)
+        
+        # Transient failures are returned without caching so the next request tries again
+        if not is_cacheable_result(result):
+            return result
+        cached = (result, put_cached_scheme_result(scheme_id, result))
+    
+    with _scheme_cache_lock:
+        _scheme_cache[scheme_id] = cached
+    return cached[0]
+
+def check_scheme_id_selenium(scheme_id):
+    """
+    Check scheme ID in a real browser with error handling
     """
     driver = None
     try:
@@ -182,35 +842,60 @@ def check_scheme_id(scheme_id):
             return {"status": "error", "error": "Unable to initialize WebDriver"}
         
         # Navigate to the website
-        logger.info(f"Checking scheme ID: {scheme_id}")
-        driver.get("https://www.sspcrs.ie/portal/checker/pub/check")
+        logger.info("Checking scheme ID: %s", scheme_id)
+        driver.get(CHECKER_URL)
         
-        # Use a longer wait time to ensure page is fully loaded
-        wait = WebDriverWait(driver, 15)
+        # With page_load_strategy 'none' get() returns straight away,
+        # so poll briefly for the elements instead of waiting for the whole page
+        wait = WebDriverWait(driver, 15, poll_frequency=POLL_FREQUENCY)
         
         # Wait for and interact with webpage elements
         input_field = wait.until(
-            EC.presence_of_element_located((By.ID, "schemeIdInput"))
+            EC.presence_of_element_located(SEL_INPUT)
         )
         input_field.clear()
         input_field.send_keys(scheme_id)
         
         # Ensure the submit button is clickable
         submit_button = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']"))
+            EC.element_to_be_clickable(SEL_SUBMIT)
         )
         submit_button.click()
         
-        # Add a brief pause to let the page transition complete
-        time.sleep(1)
-        
-        # First check for error message
         try:
-            error_element = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "alert-danger"))
+            outcome_wait = WebDriverWait(driver, 10, poll_frequency=POLL_FREQUENCY)
+            # Submitting loads a new page; wait for the form to be replaced so the
+            # outcome below can't be read from the page we just left
+            outcome_wait.until(EC.staleness_of(submit_button))
+            # Then for whichever appears first, the error banner or the result card
+            outcome_wait.until(
+                EC.any_of(
+                    EC.presence_of_element_located(SEL_ERROR),
+                    EC.visibility_of_element_located(SEL_RESULT)
+                )
             )
-            error_text = error_element.text.strip()
-            logger.info(f"Invalid scheme ID {scheme_id}: {error_text}")
+        except TimeoutException:
+            return {
+                "status": "error",
+                "code": "NO_RESPONSE",
+                "title": "System Error",
+                "message": "Unable to retrieve eligibility information"
+            }
+        
+        # Read the banner or card text with a single script instead of per-element calls
+        outcome = driver.execute_script(OUTCOME_SCRIPT, ERROR_SELECTOR, RESULT_SELECTOR)
+        
+        if outcome["kind"] == "error":
+            error_text = outcome["text"]
+            if not _NOT_FOUND_RE.search(error_text):
+                logger.warning("Unexpected checker error for scheme ID %s: %s", scheme_id, error_text)
+                return {
+                    "status": "error",
+                    "code": "NO_RESPONSE",
+                    "title": "System Error",
+                    "message": "Unable to retrieve eligibility information"
+                }
+            logger.info("Invalid scheme ID %s: %s", scheme_id, error_text)
             
             # Split the error message into title and detail
             error_lines = error_text.split('\n')
@@ -223,35 +908,22 @@ def check_scheme_id(scheme_id):
                 "title": error_title,
                 "message": error_detail
             }
-        except:
-            # If no error message found, look for results
-            try:
-                card_element = wait.until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, "#page-content > div.main-box > div.pt-2 > div > div"))
-                )
-                result = card_element.text
-                
-                # Only return success if we actually have content
-                if result and "Eligibility Details" in result:
-                    logger.info(f"Result obtained for scheme ID {scheme_id}")
-                    return {"status": "success", "result": result}
-                else:
-                    return {
-                        "status": "error",
-                        "code": "PATIENT_NOT_FOUND",
-                        "title": "Patient Not Found",
-                        "message": f"The client identifier '{scheme_id}' was not found on any scheme."
-                    }
-            except:
-                return {
-                    "status": "error",
-                    "code": "NO_RESPONSE",
-                    "title": "System Error",
-                    "message": "Unable to retrieve eligibility information"
-                }
+        
+        result = outcome["text"]
+        
+        # Only return success if we actually have content
+        if result and "Eligibility Details" in result:
+            logger.info("Result obtained for scheme ID %s", scheme_id)
+            return {"status": "success", "result": result}
+        return {
+            "status": "error",
+            "code": "PATIENT_NOT_FOUND",
+            "title": "Patient Not Found",
+            "message": f"The client identifier '{scheme_id}' was not found on any scheme."
+        }
     
     except Exception as e:
-        logger.error(f"Error checking scheme ID {scheme_id}: {e}")
+        logger.error("Error checking scheme ID %s: %s", scheme_id, e)
         return {
             "status": "error",
             "code": "SYSTEM_ERROR",
@@ -262,25 +934,37 @@ def check_scheme_id(scheme_id):
     finally:
         # Always release the driver back to pool
         if driver:
+            # Leave a blank page behind so the next check can't find this page's
+            # elements before its own navigation has replaced the document
+            try:
+                driver.get("about:blank")
+            except Exception as e:
+                logger.error("Error resetting driver: %s", e)
             WebDriverPool.release_driver(driver)
 
-def check_with_retry(scheme_id, max_retries=3):
-    for attempt in range(max_retries):
-        try:
-            result = check_scheme_id(scheme_id)
-            # Return both success AND error results without retrying
-            # Only retry on exceptions
-            return result
-        except Exception as e:
-            logger.error(f"Attempt {attempt+1} failed: {e}")
-            if attempt == max_retries - 1:  # If this was the last attempt
-                return {
-                    "status": "error",
-                    "code": "PATIENT_NOT_FOUND",
-                    "title": "Patient Not Found",
-                    "message": f"The client identifier '{scheme_id}' was not found on any scheme."
-                }
-            time.sleep(1)  # Wait before retrying
+@cache.memoize(timeout=RESPONSE_CACHE_TIMEOUT, response_filter=lambda rv: is_cacheable_result(rv[0]))
+def check_status_response(scheme_id):
+    """
+    Build the /check_status response body and status code for a validated scheme ID.
+    Stable outcomes are cached whole, so hot scheme IDs skip the lookup and parsing entirely.
+    """
+    result = check_scheme_id(scheme_id)
+    
+    # If successful and has result data, parse the text into structured data
+    if result["status"] == "success" and "result" in result:
+        parsed_data = parse_eligibility_text(result["result"])
+        return {
+            "status": "success",
+            "data": parsed_data
+        }, 200
+    else:
+        # Return the error response with 400 status code for invalid scheme IDs
+        return result, 400
+
+# Scheme IDs are short and alphanumeric; bounding the length keeps junk input away from the checker
+SCHEME_ID_MIN_LENGTH = 4
+SCHEME_ID_MAX_LENGTH = 16
+_SCHEME_ID_RE = re.compile(rf'[A-Za-z0-9]{{{SCHEME_ID_MIN_LENGTH},{SCHEME_ID_MAX_LENGTH}}}')
 
 @app.route('/check_status', methods=['POST'])
 def check_status():
@@ -289,212 +973,447 @@ def check_status():
     """
     try:
         # Parse JSON data from request
-        data = request.get_json()
+        data = load_json_body()
         scheme_id = data.get('scheme_id')
         
         if not scheme_id:
-            return jsonify({
+            return json_response({
                 "status": "error",
                 "code": "MISSING_DATA",
                 "message": "Scheme ID is required"
-            }), 400
+            }, 400)
         
-        # Validate scheme_id format (assuming it should be alphanumeric)
-        if not scheme_id.strip().isalnum():
-            return jsonify({
+        # Reject anything that can't be a scheme ID before it reaches the checker
+        if not isinstance(scheme_id, str) or not _SCHEME_ID_RE.fullmatch(scheme_id.strip()):
+            return json_response({
                 "status": "error",
                 "code": "INVALID_FORMAT",
-                "message": "Scheme ID should only contain letters and numbers"
-            }), 400
+                "message": f"Scheme ID should be {SCHEME_ID_MIN_LENGTH}-{SCHEME_ID_MAX_LENGTH} letters and numbers"
+            }, 400)
         
         # Check scheme ID and return result
-        result = check_with_retry(scheme_id)
-        
-        # If successful and has result data, parse the text into structured data
-        if result["status"] == "success" and "result" in result:
-            parsed_data = parse_eligibility_text(result["result"])
-            return jsonify({
-                "status": "success",
-                "data": parsed_data
-            }), 200
-        else:
-            # Return the error response with 400 status code for invalid scheme IDs
-            return jsonify(result), 400
+        return json_response(*check_status_response(scheme_id.strip()))
     
-    except json.JSONDecodeError:
-        return jsonify({
+    except orjson.JSONDecodeError:
+        return json_response({
             "status": "error",
             "code": "INVALID_JSON",
             "message": "Invalid JSON format in request"
-        }), 400
+        }, 400)
     
     except Exception as e:
-        logger.error(f"Unexpected error in check_status: {e}")
-        return jsonify({
+        logger.error("Unexpected error in check_status: %s", e)
+        return json_response({
             "status": "error",
             "code": "SYSTEM_ERROR",
             "message": "An unexpected error occurred"
-        }), 500
+        }, 500)
+
+# Labels on the checker's result card and the keys they're returned under
+ELIGIBILITY_FIELDS = {
+    "Eligibility": "eligibility",
+    "Scheme Id": "schemeId",
+    "Scheme Type": "schemeType",
+    "Doctor Number": "doctorNumber",
+    "Date of Birth": "dateOfBirth",
+    "Eligibility Start Date": "eligibilityStartDate",
+    "Eligibility End Date": "eligibilityEndDate"
+}
+ELIGIBILITY_HEADING = "Eligibility Details"
+# A "Label: value" line plus any following lines without a colon, which continue the value
+_FIELD_RE = re.compile(r'^[ \t]*([^:\n]*?)[ \t]*:(.*(?:\n[^:\n]*$)*)', re.MULTILINE)
 
 def parse_eligibility_text(text):
     """
     Parse the raw text response into structured JSON format
     """
     try:
-        lines = text.strip().split('\n')
         data = {}
+        for label, value in _FIELD_RE.findall(text):
+            key = ELIGIBILITY_FIELDS.get(label)
+            if key:
+                # Join a value wrapped over several lines, dropping blank lines and the card heading
+                parts = (part.strip() for part in value.split('\n'))
+                data[key] = ' '.join(part for part in parts if part and part != ELIGIBILITY_HEADING)
         
-        # Initialize with default None values for expected fields
-        expected_fields = {
-            "Eligibility": None,
-            "Scheme Id": None,
-            "Scheme Type": None,
-            "Doctor Number": None,
-            "Date of Birth": None,
-            "Eligibility Start Date": None,
-            "Eligibility End Date": None
-        }
-        
-        current_key = None
-        
-        for line in lines:
-            line = line.strip()
-            if line == "Eligibility Details":
-                continue
-                
-            # If line contains a colon, it's a key-value pair
-            if ':' in line:
-                parts = line.split(':', 1)
-                current_key = parts[0].strip()
-                value = parts[1].strip() if len(parts) > 1 else None
-                
-                if current_key in expected_fields:
-                    data[current_key] = value
-            # If there's no colon but we have a current key, this line is a value
-            elif current_key and not line.endswith(':'):
-                if current_key in data and data[current_key]:
-                    data[current_key] += ' ' + line
-                else:
-                    data[current_key] = line
-        
-        # Convert to camelCase for better JSON format
-        formatted_data = {
-            "eligibility": data.get("Eligibility"),
-            "schemeId": data.get("Scheme Id"),
-            "schemeType": data.get("Scheme Type"),
-            "doctorNumber": data.get("Doctor Number"),
-            "dateOfBirth": data.get("Date of Birth"),
-            "eligibilityStartDate": data.get("Eligibility Start Date"),
-            "eligibilityEndDate": data.get("Eligibility End Date")
-        }
-        
-        return formatted_data
+        # Fields missing from the card are returned as None
+        return {key: data.get(key) for key in ELIGIBILITY_FIELDS.values()}
         
     except Exception as e:
-        logger.error(f"Error parsing eligibility text: {e}")
+        logger.error("Error parsing eligibility text: %s", e)
         # If parsing fails, return the original text
         return {"rawText": text}
 
+# DynamoDB write batching
+# Saves from concurrent requests are coalesced into BatchWriteItem calls
+BATCH_MAX_ITEMS = 25  # BatchWriteItem accepts at most 25 items per call
+BATCH_MAX_WAIT = float(os.environ.get('BATCH_MAX_WAIT', 0.05))  # Seconds to wait for more items before flushing a batch
+BATCH_WRITE_ATTEMPTS = 4  # BatchWriteItem calls per batch before unprocessed items are given up on
+BATCH_RETRY_BACKOFF = 0.05  # Seconds before the first retry of unprocessed items, doubled each time
+BATCH_WRITERS = int(os.environ.get('BATCH_WRITERS', 4))  # Batches written in parallel, so one slow batch doesn't hold up the rest
+WRITE_QUEUE_SIZE = int(os.environ.get('WRITE_QUEUE_SIZE', 10000))  # Saves allowed to wait before new ones are refused
+SAVE_TIMEOUT = float(os.environ.get('SAVE_TIMEOUT', 10))  # Seconds a synchronous save waits for its batch
+_write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)  # (item, Future) pairs waiting to be written
+
+def batch_write_items(items):
+    """
+    Put up to BATCH_MAX_ITEMS items with BatchWriteItem, retrying unprocessed ones with backoff.
+    Returns the items DynamoDB still hadn't written after BATCH_WRITE_ATTEMPTS calls.
+    """
+    put_requests = [{'PutRequest': {'Item': item}} for item in items]
+    for attempt in range(BATCH_WRITE_ATTEMPTS):
+        if attempt:
+            time.sleep(BATCH_RETRY_BACKOFF * 2 ** (attempt - 1))
+        # The resource's client accepts and returns plain Python values, like table.put_item
+        response = table.meta.client.batch_write_item(RequestItems={table.name: put_requests})
+        put_requests = response.get('UnprocessedItems', {}).get(table.name, [])
+        if not put_requests:
+            return []
+    return [put_request['PutRequest']['Item'] for put_request in put_requests]
+
+def throughput_exceeded_error(count):
+    """
+    The error raised for items left unprocessed, so callers map it like a throttled put_item
+    """
+    return ClientError({'Error': {
+        'Code': 'ProvisionedThroughputExceededException',
+        'Message': f"{count} items were still unprocessed after {BATCH_WRITE_ATTEMPTS} attempts"
+    }}, 'BatchWriteItem')
+
+def put_items_individually(items):
+    """
+    Write items one put_item at a time, returning {transcribeId: error} for those that failed.
+    Used when a batch is rejected outright so one invalid item doesn't fail the others.
+    """
+    errors = {}
+    for item in items:
+        try:
+            table.put_item(Item=item)
+        except Exception as e:
+            logger.error("Failed to write transcription %s: %s", item['transcribeId'], e)
+            errors[item['transcribeId']] = e
+    return errors
+
+def write_items_batched(items):
+    """
+    Write up to BATCH_MAX_ITEMS items with distinct transcribeIds, returning {transcribeId: error}
+    for the ones that weren't written
+    """
+    try:
+        unprocessed = batch_write_items(items)
+    except ClientError as e:
+        # DynamoDB rejects the whole batch if any item is invalid (too large, empty key, ...)
+        if e.response['Error']['Code'] != 'ValidationException':
+            raise
+        logger.warning("Batch of %s transcriptions rejected, writing them one by one: %s", len(items), e)
+        return put_items_individually(items)
+    
+    if unprocessed:
+        logger.error("DynamoDB left %s of %s transcriptions unprocessed", len(unprocessed), len(items))
+    error = throughput_exceeded_error(len(unprocessed))
+    return {item['transcribeId']: error for item in unprocessed}
+
+def write_batch(batch):
+    """
+    Write a list of (item, Future) pairs in one BatchWriteItem and resolve their futures
+    """
+    # BatchWriteItem rejects repeated keys, so later saves of a transcribeId replace earlier ones
+    items = {item['transcribeId']: item for item, _ in batch}
+    try:
+        errors = write_items_batched(list(items.values()))
+    except Exception as e:
+        logger.error("Failed to write batch of %s transcriptions: %s", len(batch), e)
+        errors = dict.fromkeys(items, e)
+    
+    if not errors:
+        logger.info("Wrote batch of %s transcriptions to DynamoDB", len(items))
+    for item, future in batch:
+        if item['transcribeId'] in errors:
+            future.set_exception(errors[item['transcribeId']])
+        else:
+            future.set_result(True)
+
+def batch_writer_loop():
+    """
+    Drain the write queue into DynamoDB, up to BATCH_MAX_ITEMS at a time
+    """
+    while True:
+        # Block until there is something to write, then collect more items briefly
+        batch = [_write_queue.get()]
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while len(batch) < BATCH_MAX_ITEMS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        write_batch(batch)
+
+def flush_write_queue():
+    """
+    Write whatever is still queued, so saves accepted with ?async=1 survive a shutdown
+    """
+    batch = []
+    while True:
+        try:
+            batch.append(_write_queue.get_nowait())
+        except queue.Empty:
+            break
+        if len(batch) == BATCH_MAX_ITEMS:
+            write_batch(batch)
+            batch = []
+    if batch:
+        write_batch(batch)
+
+# Start the background writers
+for number in range(BATCH_WRITERS):
+    threading.Thread(target=batch_writer_loop, name=f"dynamodb-batch-writer-{number}", daemon=True).start()
+
+class TranscribeIn(BaseModel):
+    """
+    Request body for /save/transcribe, validated and coerced by pydantic-core
+    """
+    # Numeric IDs are accepted and stored as strings, unknown fields are dropped
+    model_config = ConfigDict(extra='ignore', coerce_numbers_to_str=True)
+    
+    # Key attributes of the table and the doctor index, which DynamoDB rejects when empty
+    transcribeId: str = Field(min_length=1)
+    doctorId: str = Field(min_length=1)
+    duration: int
+    transcribe: str
+    notes: Optional[str] = None
+
+def validation_error_message(error):
+    """
+    Summarize a pydantic ValidationError in the API's error message format
+    """
+    errors = error.errors()
+    if any(e['type'] == 'json_invalid' for e in errors):
+        return "Invalid JSON format"
+    
+    missing = [str(e['loc'][0]) for e in errors if e['type'] == 'missing']
+    if missing:
+        return f"Missing required field: {', '.join(missing)}"
+    
+    first = errors[0]
+    field = '.'.join(str(part) for part in first['loc']) or 'body'
+    return f"Data type error: {field}: {first['msg']}"
+
+def build_transcription_item(transcription):
+    """
+    Prepare the DynamoDB item for a validated transcription
+    """
+    # Optional fields are only included when set
+    item = transcription.model_dump(exclude_none=True)
+    # UTC ISO-8601 sorts correctly as a string and avoids local timezone lookups
+    item['timestamp'] = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+    # Sort key for the doctor index, so a doctor's transcriptions list in time order
+    item['sk'] = f"{item['timestamp']}#{item['transcribeId']}"
+    return item
+
 @app.route('/save/transcribe', methods=['POST'])
 def save_transcription():
     """
     API endpoint to save transcription data to DynamoDB
     """
     try:
-        # Parse JSON data from request
-        data = request.get_json()
-        logger.info(f"Received data: {data}")
+        # Parse and validate the JSON body in one pass
+        try:
+            transcription = TranscribeIn.model_validate_json(request.get_data(cache=False))
+        except ValidationError as e:
+            message = validation_error_message(e)
+            logger.error(message)
+            return json_response({"error": message}, 400)
+        logger.info("Received data: %s", transcription)
         
-        # Validate required fields
-        required_fields = ['transcribeId', 'doctorId', 'duration', 'transcribe']
-        for field in required_fields:
-            if field not in data:
-                logger.error(f"Missing required field: {field}")
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        item = build_transcription_item(transcription)
+        logger.info("Prepared item for DynamoDB: %s", item)
         
-        # Prepare item for DynamoDB with explicit type conversions
+        # Hand the item to the batch writer
+        future = Future()
         try:
-            item = {
-                'transcribeId': str(data['transcribeId']),  # Convert to string
-                'doctorId': str(data['doctorId']),          
-                'duration': int(data['duration']),          
-                'transcribe': str(data['transcribe']),      
-                'timestamp': str(datetime.datetime.now())
-            }
-            
-            # Add optional fields if they exist
-            if 'notes' in data:
-                item['notes'] = str(data['notes'])
-                
-            logger.info(f"Prepared item for DynamoDB: {item}")
-        except ValueError as e:
-            logger.error(f"Error converting data types: {str(e)}")
-            return jsonify({"error": f"Data type error: {str(e)}"}), 400
-            
-        # Save to DynamoDB
-        table.put_item(Item=item)
+            _write_queue.put_nowait((item, future))
+        except queue.Full:
+            logger.error("Write queue is full, refusing transcription: %s", item['transcribeId'])
+            return json_response({"error": "Too many transcriptions waiting to be saved. Please try again later."}, 503)
+        
+        # Fire-and-forget clients don't wait for DynamoDB to acknowledge the write
+        if request.args.get('async') == '1':
+            logger.info("Transcription queued for saving: %s", item['transcribeId'])
+            return json_response({
+                "status": "accepted",
+                "message": "Transcription queued for saving",
+                "data": item
+            }, 202)
+        
+        # Wait for the batch containing this item to be written
+        try:
+            future.result(timeout=SAVE_TIMEOUT)
+        except FutureTimeoutError:
+            logger.error("Timed out waiting for transcription to be saved: %s", item['transcribeId'])
+            return json_response({"error": "Saving the transcription timed out. Please try again later."}, 503)
         
-        logger.info(f"Transcription saved successfully: {item['transcribeId']}")
+        logger.info("Transcription saved successfully: %s", item['transcribeId'])
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "message": "Transcription saved successfully",
             "data": item
-        }), 200
+        }, 200)
         
     except ClientError as e:
         error_code = e.response['Error']['Code']
         error_message = e.response['Error']['Message']
-        logger.error(f"AWS DynamoDB error: {error_code} - {error_message}")
+        logger.error("AWS DynamoDB error: %s - %s", error_code, error_message)
         
         # Handle specific AWS errors
         if error_code == 'ResourceNotFoundException':
-            return jsonify({"error": "DynamoDB table not found. Please ensure the table exists."}), 500
+            return json_response({"error": "DynamoDB table not found. Please ensure the table exists."}, 500)
         elif error_code == 'ProvisionedThroughputExceededException':
-            return jsonify({"error": "DynamoDB throughput exceeded. Please try again later."}), 429
+            return json_response({"error": "DynamoDB throughput exceeded. Please try again later."}, 429)
         elif error_code == 'AccessDeniedException':
-            return jsonify({"error": "Access denied to DynamoDB. Check AWS credentials and permissions."}), 403
+            return json_response({"error": "Access denied to DynamoDB. Check AWS credentials and permissions."}, 403)
         else:
-            return jsonify({"error": f"Database error: {error_message}"}), 500
-    except json.JSONDecodeError:
+            return json_response({"error": f"Database error: {error_message}"}, 500)
+    except Exception as e:
+        logger.error("Unexpected error in save_transcription: %s", e)
+        return json_response({"error": f"Internal server error: {str(e)}"}, 500)
+
+# Bulk save configuration
+BULK_MAX_ITEMS = 1000  # Largest list accepted by /save/transcribe/bulk
+BULK_WRITE_CONCURRENCY = 4  # Batch writers run in parallel for one bulk request
+_bulk_executor = ThreadPoolExecutor(max_workers=BULK_WRITE_CONCURRENCY * 4, thread_name_prefix="bulk-writer")
+
+def write_items(items):
+    """
+    Write items 25 per BatchWriteItem call, returning {transcribeId: error} for those not written
+    """
+    # Later entries with the same transcribeId replace earlier ones, as BatchWriteItem requires
+    items = list({item['transcribeId']: item for item in items}.values())
+    errors = {}
+    for start in range(0, len(items), BATCH_MAX_ITEMS):
+        batch = items[start:start + BATCH_MAX_ITEMS]
+        try:
+            errors.update(write_items_batched(batch))
+        except Exception as e:
+            # Only this slice failed; earlier and later slices are reported on their own
+            logger.error("Failed to write batch of %s transcriptions: %s", len(batch), e)
+            errors.update(dict.fromkeys((item['transcribeId'] for item in batch), e))
+    return errors
+
+@app.route('/save/transcribe/bulk', methods=['POST'])
+def save_transcriptions_bulk():
+    """
+    API endpoint to save a list of transcriptions to DynamoDB in batches
+    """
+    try:
+        data = load_json_body()
+        
+        if not isinstance(data, list) or not data:
+            return json_response({"error": "Request body must be a non-empty JSON array of transcriptions"}, 400)
+        if len(data) > BULK_MAX_ITEMS:
+            return json_response({"error": f"At most {BULK_MAX_ITEMS} transcriptions can be saved per request"}, 413)
+        
+        # Validate every entry, reporting problems per item instead of rejecting the whole list
+        results = []
+        items = {}
+        for index, entry in enumerate(data):
+            try:
+                transcription = TranscribeIn.model_validate(entry)
+            except ValidationError as e:
+                results.append({"index": index, "status": "error", "error": validation_error_message(e)})
+                continue
+            items[index] = build_transcription_item(transcription)
+            results.append({"index": index, "transcribeId": transcription.transcribeId, "status": "success"})
+        logger.info("Received %s transcriptions for bulk save, %s valid", len(data), len(items))
+        
+        # Spread items over parallel writers, keeping each transcribeId on one writer
+        # so repeated IDs are deduplicated rather than racing each other
+        chunks = [[] for _ in range(BULK_WRITE_CONCURRENCY)]
+        for index, item in items.items():
+            chunks[hash(item['transcribeId']) % BULK_WRITE_CONCURRENCY].append(index)
+        futures = {
+            _bulk_executor.submit(write_items, [items[index] for index in chunk]): chunk
+            for chunk in chunks if chunk
+        }
+        
+        for future, chunk in futures.items():
+            try:
+                errors = future.result()
+            except Exception as e:
+                errors = {items[index]['transcribeId']: e for index in chunk}
+            
+            # Mark only the items that weren't written
+            for index in chunk:
+                error = errors.get(items[index]['transcribeId'])
+                if error is None:
+                    continue
+                error_message = error.response['Error']['Message'] if isinstance(error, ClientError) else str(error)
+                results[index]["status"] = "error"
+                results[index]["error"] = f"Database error: {error_message}"
+            if errors:
+                logger.error("Bulk write left %s of %s transcriptions unwritten", len(errors), len(chunk))
+        
+        saved = sum(1 for result in results if result["status"] == "success")
+        failed = len(results) - saved
+        logger.info("Bulk save finished: %s saved, %s failed", saved, failed)
+        
+        if failed == 0:
+            status, code = "success", 200
+        elif saved == 0:
+            status, code = "error", 400 if not items else 500
+        else:
+            status, code = "partial", 207
+        
+        return json_response({
+            "status": status,
+            "saved": saved,
+            "failed": failed,
+            "results": results
+        }, code)
+    
+    except orjson.JSONDecodeError:
         logger.error("Invalid JSON format")
-        return jsonify({"error": "Invalid JSON format"}), 400
+        return json_response({"error": "Invalid JSON format"}, 400)
     except Exception as e:
-        logger.error(f"Unexpected error in save_transcription: {str(e)}")
-        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+        logger.error("Unexpected error in save_transcriptions_bulk: %s", e)
+        return json_response({"error": f"Internal server error: {str(e)}"}, 500)
 
 # Cleanup function for WebDriver pool
 def cleanup_drivers():
     """
     Cleanup WebDriver instances on application shutdown
     """
-    for driver in WebDriverPool._drivers:
+    while True:
+        try:
+            driver = WebDriverPool._pool.get_nowait()
+        except queue.Empty:
+            break
         try:
             driver.quit()
         except Exception as e:
-            logger.error(f"Error closing driver: {e}")
+            logger.error("Error closing driver: %s", e)
 
 # Register cleanup function to run on application exit
 import atexit
 atexit.register(cleanup_drivers)
+atexit.register(flush_write_queue)
 
 # Health check endpoint for testing connectivity
+# The health body never changes, so it is serialized once
+HEALTHY_BODY = orjson.dumps({"status": "healthy", "service": "online"})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
     Simple health check endpoint
     """
-    try:
-        return jsonify({
-            "status": "healthy",
-            "service": "online"
-        }), 200
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return jsonify({
-            "status": "unhealthy",
-            "error": str(e)
-        }), 500
+    # A new Response each time, since CORS and Flask add headers to the object returned
+    return app.response_class(HEALTHY_BODY, status=200, mimetype='application/json',
+                              headers={'Cache-Control': 'no-store'})
 
 if __name__ == '__main__':
     # If running with Python directly, log all the environment variables that might affect AWS
@@ -509,8 +1428,12 @@ if __name__ == '__main__':
         logger.warning("AWS_SECRET_ACCESS_KEY is not set")
         
     if os.environ.get('AWS_DEFAULT_REGION'):
-        logger.info(f"AWS_DEFAULT_REGION is set to {os.environ.get('AWS_DEFAULT_REGION')}")
+        logger.info("AWS_DEFAULT_REGION is set to %s", os.environ.get('AWS_DEFAULT_REGION'))
     else:
         logger.warning("AWS_DEFAULT_REGION is not set, using ap-south-1")
     
-    app.run(host='0.0.0.0', port=80, debug=True)
\ No newline at end of file
+    # Serve with gevent so slow Selenium and DynamoDB calls don't block other requests.
+    # The Docker image runs several of these under gunicorn instead (see the Dockerfile)
+    from gevent.pywsgi import WSGIServer
+    logger.info("Starting gevent WSGI server on port 80")
+    WSGIServer(('0.0.0.0', 80), app).serve_forever()
\ No newline at end of file